@@ -1,31 +1,26 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from xgboost import XGBRegressor
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error
+from xgb_pipeline import train_xgb, predict_in_chunks, TARGET
+from results_store import append_results, ANOMALY_LABEL
+
+# Load dataset (cached feature arrays, CSV only parsed when it changes) and train model
+# Histogram trees, early stopping on the validation block just before the test split,
+# then refit on train+validation for the chosen number of rounds
+# Paths are relative to the repository root
+booster, df_test, features = train_xgb(
+    processed_file="data/preprocessed_dataset.csv",
+    n_estimators=200, learning_rate=0.1, max_depth=6,
+    early_stopping_rounds=20, n_threads=None,
+    test_size=0.1
+)
 
-# Load dataset
-df = pd.read_csv(r"C:\Users\dillo\Downloads\SIH_2025-main\SIH_2025-main\data\preprocessed_dataset.csv")
-
-# Convert datetime
-df['datetime'] = pd.to_datetime(df['datetime'], format="%d-%m-%Y %H:%M")
-
-# Features (exclude target)
-features = [c for c in df.columns if c not in ['datetime', 'Power demand']]
-
-X = df[features]
-y = df['Power demand']
-
-# Split data (train on past, test on recent)
-X_train, X_test, y_train, y_test = train_test_split(X, y, shuffle=False, test_size=0.1)
-
-# Train model (ONLY ONCE)
-model = XGBRegressor(n_estimators=200, learning_rate=0.1, max_depth=6)
-model.fit(X_train, y_train)
+# Test split (train on past, test on recent)
+y_test = df_test[TARGET]
 
 # Predict
-y_pred = model.predict(X_test)
+y_pred = predict_in_chunks(booster, df_test)
 
 # Evaluate
 mae = mean_absolute_error(y_test, y_pred)
@@ -33,7 +28,7 @@ print("MAE:", mae)
 
 # Create results dataframe
 df_results = pd.DataFrame({
-    "datetime": df['datetime'].iloc[-len(y_test):],
+    "datetime": df_test['datetime'],
     "actual": y_test.values,  # Convert to numpy array to avoid index issues
     "predicted": y_pred
 })
@@ -53,7 +48,7 @@ df_results["Tariff"] = df_results["predicted"].apply(assign_tariff)
 df_results["error"] = abs(df_results["actual"] - df_results["predicted"])
 df_results["Anomaly"] = np.where(
     df_results["error"] > 0.2 * df_results["predicted"],
-    "⚠ Anomaly",
+    ANOMALY_LABEL,
     "Normal"
 )
 
@@ -63,7 +58,7 @@ plt.plot(df_results["datetime"], df_results["actual"], label="Actual Demand", co
 plt.plot(df_results["datetime"], df_results["predicted"], label="Predicted Demand", color="orange")
 
 # Highlight anomalies (FIXED)
-anomaly_mask = df_results["Anomaly"] == "⚠ Anomaly"
+anomaly_mask = df_results["Anomaly"] == ANOMALY_LABEL
 anomaly_data = df_results[anomaly_mask]
 if len(anomaly_data) > 0:
     plt.scatter(anomaly_data["datetime"], anomaly_data["actual"], color="red", label=f"Anomaly ({len(anomaly_data)})")
@@ -134,6 +129,7 @@ for tariff, count in tariff_counts.items():
     percentage = (count / len(df_results)) * 100
     print(f"  {tariff}: {count} periods ({percentage:.1f}%)")
 
-# Save results
-df_results.to_csv("forecast_results.csv", index=False)
-print(f"\nResults saved to 'forecast_results.csv'")
\ No newline at end of file
+# Save results (day-partitioned Parquet, dictionary-encoded Tariff/Anomaly)
+# Query with results_store.read_results / anomalies_in_range
+append_results(df_results, "outputs/forecast_results", overwrite_days=True)
+print(f"\nResults saved to 'outputs/forecast_results/'")
\ No newline at end of file
@@ -0,0 +1,282 @@
+import hashlib
+import json
+import math
+import multiprocessing as mp
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from utils import file_fingerprint
+
+# numpy/pandas/TensorFlow/Prophet are imported inside the trial functions, so worker
+# processes only load them after _init_worker has set thread limits and CPU affinity
+
+# Search spaces. Keys match the keyword arguments of train_lstm / train_prophet,
+# so the best config can be passed straight back to them.
+LSTM_SPACE = {
+    "seq_length": [12, 24, 48, 96],
+    "batch_size": [16, 32, 64],
+    "units": [32, 64, 128],
+    "dropout": [0.0, 0.1, 0.2, 0.3],
+}
+
+PROPHET_SPACE = {
+    "daily_seasonality": [True, False],
+    "weekly_seasonality": [True, False, "auto"],
+    "yearly_seasonality": [True, False],
+    "seasonality_mode": ["additive", "multiplicative"],
+    "changepoint_prior_scale": [0.001, 0.01, 0.05, 0.1, 0.5],
+}
+
+# CPUs the current worker process is pinned to (set by _init_worker)
+_WORKER_CPUS = None
+
+
+def _allowed_cpus():
+    """
+    Returns the CPUs this process may run on. Respects taskset, cpusets and
+    scheduler allocations, which os.cpu_count() ignores.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _init_worker(slots, cpus, threads_per_worker):
+    """
+    Pins a worker process to its own block of the allowed CPUs and caps the thread
+    pools of the numeric libraries to match. Runs before numpy, pandas, TensorFlow or
+    Prophet are imported in the worker, so their pools start at the capped size.
+    """
+    global _WORKER_CPUS
+    slot = slots.get()
+    _WORKER_CPUS = sorted({cpus[(slot * threads_per_worker + i) % len(cpus)]
+                           for i in range(threads_per_worker)})
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, _WORKER_CPUS)
+
+    n = str(threads_per_worker)
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS",
+                "TF_NUM_INTRAOP_THREADS"):
+        os.environ[var] = n
+    os.environ["TF_NUM_INTEROP_THREADS"] = "1"
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+
+
+def _lstm_trial(config, budget, processed_file, patience=3, train_frac=0.8):
+    """
+    Trains one LSTM config for up to `budget` epochs on the same time split as
+    train_lstm, stopping early once validation loss stops improving.
+    Returns the best validation MSE (on scaled demand).
+    """
+    from keras.callbacks import EarlyStopping
+    from lstm_model import build_lstm, load_lstm_data
+
+    seq_length = config["seq_length"]
+    _, _, _, (X_train, y_train, X_test, y_test) = load_lstm_data(
+        processed_file, seq_length, train_frac
+    )
+
+    model = build_lstm(seq_length, config["units"], config["dropout"])
+    history = model.fit(
+        X_train, y_train,
+        validation_data=(X_test, y_test),
+        epochs=int(budget),
+        batch_size=config["batch_size"],
+        verbose=0,
+        callbacks=[EarlyStopping(monitor="val_loss", patience=patience)]
+    )
+    val_loss = history.history["val_loss"]
+    return {"score": float(min(val_loss)), "epochs_run": len(val_loss)}
+
+
+def _prophet_trial(config, budget, processed_file, train_frac=0.8):
+    """
+    Fits one Prophet config on the most recent `budget` fraction of the training
+    window and scores it on the held-out remainder.
+    Returns the validation RMSE.
+    """
+    import numpy as np
+    import pandas as pd
+    from prophet import Prophet
+
+    data = pd.read_csv(processed_file, parse_dates=["datetime"], dayfirst=True)
+    df = data[["datetime", "Power demand"]].rename(columns={"datetime": "ds", "Power demand": "y"})
+    split = int(len(df) * train_frac)
+    train = df.iloc[split - max(2, int(split * budget)):split]
+    valid = df.iloc[split:]
+
+    model = Prophet(**config)
+    model.fit(train)
+    pred = model.predict(valid[["ds"]])["yhat"].values
+    rmse = float(np.sqrt(np.mean((valid["y"].values - pred) ** 2)))
+    return {"score": rmse}
+
+
+MODELS = {
+    # budget = max training epochs
+    "lstm": {"space": LSTM_SPACE, "trial": _lstm_trial, "min_budget": 3, "max_budget": 30,
+             "trial_kwargs": {"patience": 3, "train_frac": 0.8}},
+    # budget = fraction of the training window used
+    "prophet": {"space": PROPHET_SPACE, "trial": _prophet_trial, "min_budget": 0.25, "max_budget": 1.0,
+                "trial_kwargs": {"train_frac": 0.8}},
+}
+
+
+def _config_key(config):
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _cache_path(cache_dir, model_name, data_hash, config, trial_kwargs, budget):
+    # trial settings (patience, split) change the score, so they're part of the key
+    key = _config_key({"config": config, "trial_kwargs": trial_kwargs})
+    return os.path.join(cache_dir, model_name, data_hash[:16], f"{key}_b{budget}.json")
+
+
+def _run_trial(trial, config, budget, processed_file, trial_kwargs, cache_file):
+    """
+    Worker entry point: runs a trial and writes its result to the cache.
+    The cache file is written atomically so an interrupted search never leaves
+    a half-written result behind.
+    """
+    result = trial(config, budget, processed_file, **trial_kwargs)
+    result.update({"config": config, "budget": budget, "trial_kwargs": trial_kwargs,
+                   "cpus": _WORKER_CPUS})
+
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(result, f, indent=2)
+    os.replace(tmp_file, cache_file)
+    return result
+
+
+def sample_configs(space, n_trials, seed=0):
+    """
+    Draws n_trials distinct configs from a search space.
+    Sampling is seeded, so a resumed search draws the same configs and hits the cache.
+    """
+    rng = random.Random(seed)
+    n_total = math.prod(len(v) for v in space.values())
+    configs, seen = [], set()
+    while len(configs) < min(n_trials, n_total):
+        config = {k: rng.choice(v) for k, v in space.items()}
+        key = _config_key(config)
+        if key not in seen:
+            seen.add(key)
+            configs.append(config)
+    return configs
+
+
+def _evaluate(model_name, configs, budget, processed_file, trial_kwargs, data_hash,
+              cache_dir, executor):
+    """
+    Evaluates configs at a given budget, reusing cached results where available.
+    """
+    results, futures = [], {}
+    for config in configs:
+        cache_file = _cache_path(cache_dir, model_name, data_hash, config, trial_kwargs, budget)
+        if os.path.exists(cache_file):
+            with open(cache_file) as f:
+                results.append(json.load(f))
+        else:
+            futures[executor.submit(_run_trial, MODELS[model_name]["trial"], config, budget,
+                                    processed_file, trial_kwargs, cache_file)] = config
+
+    n_cached = len(results)
+    for future in as_completed(futures):
+        result = future.result()
+        results.append(result)
+        print(f"   trial {len(results) - n_cached}/{len(futures)} done: "
+              f"score={result['score']:.5f} {result['config']}")
+    if n_cached:
+        print(f"   {n_cached} result(s) loaded from cache")
+    return sorted(results, key=lambda r: r["score"])
+
+
+def run_search(model_name="lstm",
+               processed_file="data/preprocessed_dataset.csv",
+               method="halving",
+               n_trials=27,
+               eta=3,
+               min_budget=None,
+               max_budget=None,
+               n_workers=None,
+               threads_per_worker=1,
+               trial_kwargs=None,
+               cache_dir="saved_models/hparam_cache",
+               output_file=None,
+               seed=0):
+    """
+    Runs a parallel hyperparameter search for the LSTM or Prophet model.
+
+    Parameters:
+    - model_name: 'lstm' or 'prophet'
+    - method: 'random' (every trial at max_budget) or 'halving' (successive halving:
+      start all trials at min_budget, keep the best 1/eta and multiply the budget by eta)
+    - n_workers: number of trial processes (default: allowed CPUs // threads_per_worker)
+    - threads_per_worker: CPU threads pinned to each worker process
+    - trial_kwargs: overrides for the trial settings in MODELS (e.g. {'patience': 5})
+    - cache_dir: completed trials are cached here, keyed by data hash, config and budget,
+      so rerunning an interrupted search only runs the missing trials
+    - output_file: if set, the ranked final results are saved as JSON
+
+    Returns a list of result dicts ({'score', 'config', 'budget', ...}) sorted best first.
+    """
+    if model_name not in MODELS:
+        raise ValueError(f"❌ Unknown model '{model_name}', expected one of {list(MODELS)}")
+    if method not in ("random", "halving"):
+        raise ValueError(f"❌ Unknown search method '{method}', expected 'random' or 'halving'")
+
+    spec = MODELS[model_name]
+    min_budget = spec["min_budget"] if min_budget is None else min_budget
+    max_budget = spec["max_budget"] if max_budget is None else max_budget
+    trial_kwargs = {**spec["trial_kwargs"], **(trial_kwargs or {})}
+
+    data_hash = file_fingerprint(processed_file)
+    configs = sample_configs(spec["space"], n_trials, seed)
+    cpus = _allowed_cpus()
+    if n_workers is None:
+        n_workers = max(1, len(cpus) // threads_per_worker)
+    n_workers = max(1, min(n_workers, len(configs)))
+    budget = max_budget if method == "random" else min_budget
+
+    # spawn: workers start clean so thread limits apply before TF/Prophet load
+    ctx = mp.get_context("spawn")
+    slots = ctx.Queue()
+    for i in range(n_workers):
+        slots.put(i)
+
+    print(f"⏳ {method} search for {model_name}: {len(configs)} configs, "
+          f"{n_workers} workers x {threads_per_worker} thread(s)")
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=ctx,
+                             initializer=_init_worker,
+                             initargs=(slots, cpus, threads_per_worker)) as executor:
+        while True:
+            print(f"⏳ Evaluating {len(configs)} config(s) at budget {budget}...")
+            results = _evaluate(model_name, configs, budget, processed_file, trial_kwargs,
+                                data_hash, cache_dir, executor)
+            if budget >= max_budget or len(configs) <= 1:
+                break
+            configs = [r["config"] for r in results[:max(1, len(configs) // eta)]]
+            budget = min(budget * eta, max_budget)
+            if isinstance(min_budget, int) and isinstance(max_budget, int):
+                budget = int(budget)
+
+    best = results[0]
+    print(f"✅ Best {model_name} config: {best['config']} (score={best['score']:.5f}, budget={best['budget']})")
+
+    if output_file is not None:
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        with open(output_file, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Search results saved at {output_file}")
+
+    return results
+
+
+# ----------------------------
+# If run as script
+# ----------------------------
+if __name__ == "__main__":
+    run_search("lstm", output_file="outputs/hparam_lstm.json")
+    run_search("prophet", output_file="outputs/hparam_prophet.json")
@@ -15,13 +15,25 @@ def create_sequences(data, seq_length=24):
         y.append(data[i+seq_length])
     return np.array(X), np.array(y)
 
-def train_lstm(processed_file="data/preprocessed_dataset.csv",
-               model_file="saved_models/lstm_model.h5",
-               scaler_file="saved_models/demand_scaler.pkl",
-               output_json_5min="outputs/forecast_lstm_5min.json",
-               output_json_hourly="outputs/forecast_lstm_hourly.json",
-               seq_length=24, epochs=30, batch_size=16):
-    
+def build_lstm(seq_length=24, units=64, dropout=0.2):
+    model = Sequential([
+        LSTM(units, input_shape=(seq_length,1)),
+        Dropout(dropout),
+        Dense(1)
+    ])
+    model.compile(optimizer='adam', loss='mse')
+    return model
+
+def load_lstm_data(processed_file="data/preprocessed_dataset.csv", seq_length=24, train_frac=0.8):
+    """
+    Loads demand, scales it to [0, 1], builds sequences and splits them in time order.
+
+    Returns:
+    - data: the loaded DataFrame
+    - scaler: fitted MinMaxScaler
+    - demand_scaled: scaled demand, shape (n, 1)
+    - (X_train, y_train, X_test, y_test): sequences shaped (n, seq_length, 1) and targets
+    """
     # 1. Load dataset
     data = pd.read_csv(processed_file, parse_dates=["datetime"], dayfirst=True)
     demand = data["Power demand"].values.reshape(-1,1)
@@ -29,25 +41,31 @@ def train_lstm(processed_file="data/preprocessed_dataset.csv",
     # 2. Scale demand
     scaler = MinMaxScaler()
     demand_scaled = scaler.fit_transform(demand)
-    os.makedirs("saved_models", exist_ok=True)
-    joblib.dump(scaler, scaler_file)
     
     # 3. Create sequences
     X, y = create_sequences(demand_scaled, seq_length)
     X = X.reshape((X.shape[0], X.shape[1], 1))
     
     # 4. Train/Test split
-    split = int(len(X) * 0.8)
-    X_train, X_test = X[:split], X[split:]
-    y_train, y_test = y[:split], y[split:]
+    split = int(len(X) * train_frac)
+    return data, scaler, demand_scaled, (X[:split], y[:split], X[split:], y[split:])
+
+def train_lstm(processed_file="data/preprocessed_dataset.csv",
+               model_file="saved_models/lstm_model.h5",
+               scaler_file="saved_models/demand_scaler.pkl",
+               output_json_5min="outputs/forecast_lstm_5min.json",
+               output_json_hourly="outputs/forecast_lstm_hourly.json",
+               seq_length=24, epochs=30, batch_size=16, units=64, dropout=0.2):
+    
+    # 1-4. Load, scale, create sequences and split
+    data, scaler, demand_scaled, (X_train, y_train, X_test, y_test) = load_lstm_data(
+        processed_file, seq_length
+    )
+    os.makedirs("saved_models", exist_ok=True)
+    joblib.dump(scaler, scaler_file)
     
     # 5. Build LSTM model
-    model = Sequential([
-        LSTM(64, input_shape=(seq_length,1)),
-        Dropout(0.2),
-        Dense(1)
-    ])
-    model.compile(optimizer='adam', loss='mse')
+    model = build_lstm(seq_length, units, dropout)
     
     # 6. Train model with progress
     print("⏳ Training LSTM model...")
@@ -8,7 +8,12 @@ def train_prophet(
     processed_file="data/preprocessed_dataset.csv", 
     model_file="saved_models/prophet_model.pkl", 
     output_json_5min="outputs/forecast_prophet_5min.json",
-    output_json_hourly="outputs/forecast_prophet_hourly.json"
+    output_json_hourly="outputs/forecast_prophet_hourly.json",
+    daily_seasonality=True,
+    weekly_seasonality="auto",
+    yearly_seasonality=True,
+    seasonality_mode="additive",
+    changepoint_prior_scale=0.05
 ):
     # ----------------------------
     # 1. Load processed dataset
@@ -24,7 +29,13 @@ def train_prophet(
     # 3. Initialize and train Prophet
     # ----------------------------
     print("⏳ Training Prophet model...")
-    model = Prophet(daily_seasonality=True, yearly_seasonality=True)
+    model = Prophet(
+        daily_seasonality=daily_seasonality,
+        weekly_seasonality=weekly_seasonality,
+        yearly_seasonality=yearly_seasonality,
+        seasonality_mode=seasonality_mode,
+        changepoint_prior_scale=changepoint_prior_scale
+    )
     model.fit(df)
     
     # ----------------------------
@@ -0,0 +1,128 @@
+import os
+import shutil
+import uuid
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+CATEGORICAL_COLUMNS = ["Tariff", "Anomaly"]
+ANOMALY_LABEL = "⚠ Anomaly"
+
+# Day partitions are ISO date strings, so they sort and compare correctly as text
+PARTITIONING = ds.partitioning(pa.schema([("day", pa.string())]), flavor="hive")
+
+
+def append_results(df_results, root_path="outputs/forecast_results",
+                   compression="zstd", row_group_size=64_000, overwrite_days=False):
+    """
+    Appends a chunk of scoring results to a Parquet dataset partitioned by day.
+
+    Each call writes new files (one per day touched) without rewriting existing ones,
+    so results can be streamed in as they're scored. Tariff and Anomaly are stored
+    dictionary-encoded, and every file is compressed.
+
+    Parameters:
+    - df_results: DataFrame with columns ['datetime', 'actual', 'predicted', 'Tariff', 'error', 'Anomaly']
+    - root_path: dataset directory
+    - compression: Parquet codec ('zstd', 'snappy', 'gzip', ...)
+    - row_group_size: rows per row group; smaller groups give finer datetime pruning
+    - overwrite_days: if True, replace any existing data for the days in this chunk
+    """
+    if "datetime" not in df_results.columns:
+        raise ValueError("❌ df_results must contain a 'datetime' column")
+    if df_results.empty:
+        return
+
+    df = df_results.copy()
+    df["datetime"] = pd.to_datetime(df["datetime"])
+    df["day"] = df["datetime"].dt.strftime("%Y-%m-%d")
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    os.makedirs(root_path, exist_ok=True)
+    pq.write_to_dataset(
+        table,
+        root_path,
+        partitioning=PARTITIONING,
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="delete_matching" if overwrite_days else "overwrite_or_ignore",
+        compression=compression,
+        use_dictionary=[c for c in CATEGORICAL_COLUMNS if c in df.columns],
+        row_group_size=row_group_size,
+    )
+
+
+def _range_filter(start=None, end=None):
+    """
+    Builds a dataset filter for [start, end) on both the day partition (skips whole
+    directories) and the datetime column (pruned by row-group statistics).
+    """
+    expr = None
+    if start is not None:
+        start = pd.Timestamp(start)
+        expr = (ds.field("day") >= start.strftime("%Y-%m-%d")) & \
+               (ds.field("datetime") >= pa.scalar(start, type=pa.timestamp("ns")))
+    if end is not None:
+        end = pd.Timestamp(end)
+        cond = (ds.field("day") <= end.strftime("%Y-%m-%d")) & \
+               (ds.field("datetime") < pa.scalar(end, type=pa.timestamp("ns")))
+        expr = cond if expr is None else expr & cond
+    return expr
+
+
+def _read(root_path, expr, columns):
+    dataset = ds.dataset(root_path, format="parquet", partitioning=PARTITIONING)
+    if columns is not None and "datetime" not in columns:
+        columns = ["datetime"] + list(columns)
+
+    df = dataset.to_table(columns=columns, filter=expr).to_pandas()
+    if "day" in df.columns:
+        df = df.drop(columns="day")
+    return df.sort_values("datetime").reset_index(drop=True)
+
+
+def read_results(root_path="outputs/forecast_results", start=None, end=None, columns=None):
+    """
+    Reads scoring results in [start, end) without loading the whole dataset.
+
+    Day partitions outside the range are skipped entirely, and the datetime filter is
+    pushed down to Parquet row-group statistics inside the remaining files.
+
+    Parameters:
+    - start, end: anything pd.Timestamp accepts, or None for an open bound
+    - columns: list of columns to load (None = all)
+
+    Returns a DataFrame sorted by datetime.
+    """
+    return _read(root_path, _range_filter(start, end), columns)
+
+
+def anomalies_in_range(root_path="outputs/forecast_results", start=None, end=None, columns=None):
+    """
+    Returns only the rows flagged as anomalies in [start, end).
+    The anomaly filter is applied by the dataset scan, so normal rows are never materialized.
+    """
+    expr = ds.field("Anomaly") == ANOMALY_LABEL
+    range_expr = _range_filter(start, end)
+    if range_expr is not None:
+        expr = range_expr & expr
+    return _read(root_path, expr, columns)
+
+
+# ----------------------------
+# If run as script: convert an existing forecast_results.csv in streamed chunks
+# Paths are relative to the repository root
+# ----------------------------
+if __name__ == "__main__":
+    src_file = "src/models/forecast_results.csv"
+    root_path = "outputs/forecast_results"
+    if not os.path.exists(src_file):
+        raise FileNotFoundError(f"❌ {src_file} not found, nothing to convert")
+
+    shutil.rmtree(root_path, ignore_errors=True)
+    for chunk in pd.read_csv(src_file, parse_dates=["datetime"], chunksize=100_000):
+        append_results(chunk, root_path)
+    print(f"✅ {src_file} converted to '{root_path}/'")
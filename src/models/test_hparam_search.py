@@ -0,0 +1,84 @@
+import glob
+import os
+import queue
+
+import hparam_search
+from hparam_search import run_search, sample_configs
+
+SPACE = {"a": [1, 2, 3], "b": [10, 20, 30]}
+
+
+def _stub_trial(config, budget, processed_file, offset=0):
+    # lower is better; module-level so spawned workers can import it
+    return {"score": config["a"] * 100 + config["b"] + offset - budget}
+
+
+def _failing_trial(config, budget, processed_file, offset=0):
+    raise AssertionError("trial ran despite a cached result")
+
+
+def _register_stub(monkeypatch, trial):
+    monkeypatch.setitem(hparam_search.MODELS, "stub", {
+        "space": SPACE, "trial": trial, "min_budget": 1, "max_budget": 9,
+        "trial_kwargs": {"offset": 0},
+    })
+
+
+def test_sample_configs_deterministic_and_distinct():
+    first = sample_configs(SPACE, 5, seed=3)
+    assert first == sample_configs(SPACE, 5, seed=3)
+    assert len({tuple(sorted(c.items())) for c in first}) == 5
+    # asking for more configs than the space holds returns the whole space
+    assert len(sample_configs(SPACE, 50)) == 9
+
+
+def test_workers_pinned_within_allowed_cpus(monkeypatch):
+    # e.g. taskset -c 4-7: CPU 0 is not usable
+    pinned = {}
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: {6, 4, 7, 5}, raising=False)
+    monkeypatch.setattr(os, "sched_setaffinity", lambda pid, cpus: pinned.update({pid: cpus}),
+                        raising=False)
+    monkeypatch.setattr(os, "environ", dict(os.environ))
+    monkeypatch.setattr(hparam_search, "_WORKER_CPUS", None)
+
+    cpus = hparam_search._allowed_cpus()
+    assert cpus == [4, 5, 6, 7]
+
+    slots = queue.Queue()
+    slots.put(1)
+    hparam_search._init_worker(slots, cpus, 2)
+    assert pinned == {0: [6, 7]}
+    assert os.environ["OMP_NUM_THREADS"] == "2"
+
+    # more workers than allowed CPUs wrap around inside the allowed set
+    slots.put(2)
+    hparam_search._init_worker(slots, cpus, 3)
+    assert pinned == {0: [4, 6, 7]}
+
+
+def test_halving_schedule_and_resume(tmp_path, monkeypatch):
+    data = tmp_path / "data.csv"
+    data.write_text("datetime,Power demand\n")
+    cache_dir = str(tmp_path / "cache")
+    _register_stub(monkeypatch, _stub_trial)
+
+    results = run_search("stub", str(data), method="halving", n_trials=9, eta=3,
+                         n_workers=2, cache_dir=cache_dir)
+    assert results[0]["config"] == {"a": 1, "b": 10}
+    assert results[0]["budget"] == 9
+
+    # 9 configs at budget 1, best 3 at budget 3, best 1 at budget 9
+    counts = {b: len(glob.glob(os.path.join(cache_dir, "stub", "*", f"*_b{b}.json")))
+              for b in (1, 3, 9)}
+    assert counts == {1: 9, 3: 3, 9: 1}
+
+    # a rerun is served entirely from the cache
+    _register_stub(monkeypatch, _failing_trial)
+    assert run_search("stub", str(data), n_trials=9, eta=3, n_workers=2,
+                      cache_dir=cache_dir) == results
+
+    # changing trial settings changes the cache key
+    _register_stub(monkeypatch, _stub_trial)
+    run_search("stub", str(data), method="random", n_trials=2, n_workers=1,
+               trial_kwargs={"offset": 1}, cache_dir=cache_dir)
+    assert len(glob.glob(os.path.join(cache_dir, "stub", "*", "*_b9.json"))) == 3
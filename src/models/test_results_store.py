@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+import pyarrow.dataset as ds
+
+from results_store import (ANOMALY_LABEL, PARTITIONING, _range_filter, anomalies_in_range,
+                           append_results, read_results)
+
+
+def _results(start, periods):
+    dt = pd.date_range(start, periods=periods, freq="h")
+    return pd.DataFrame({
+        "datetime": dt,
+        "actual": range(periods),
+        "predicted": range(periods),
+        "Tariff": ["Normal Tariff"] * periods,
+        "error": [0.0] * periods,
+        "Anomaly": [ANOMALY_LABEL if h % 6 == 0 else "Normal" for h in dt.hour],
+    })
+
+
+def test_round_trip_skips_partitions(tmp_path):
+    root = str(tmp_path / "results")
+    # three days, appended in two chunks
+    full = _results("2024-07-01", 72)
+    append_results(full.iloc[:30], root)
+    append_results(full.iloc[30:], root)
+
+    df = read_results(root, "2024-07-02 03:00", "2024-07-02 09:00")
+    assert df["datetime"].tolist() == list(pd.date_range("2024-07-02 03:00", periods=6, freq="h"))
+    assert isinstance(df["Anomaly"].dtype, pd.CategoricalDtype)
+
+    # only the 2024-07-02 partition is scanned
+    dataset = ds.dataset(root, format="parquet", partitioning=PARTITIONING)
+    fragments = list(dataset.get_fragments(filter=_range_filter("2024-07-02 03:00", "2024-07-02 09:00")))
+    assert fragments and all("day=2024-07-02" in f.path for f in fragments)
+
+    anomalies = anomalies_in_range(root, "2024-07-02", "2024-07-03", columns=["actual"])
+    assert anomalies["datetime"].dt.hour.tolist() == [0, 6, 12, 18]
+    assert list(anomalies.columns) == ["datetime", "actual"]
+
+
+def test_overwrite_days_replaces_existing_day(tmp_path):
+    root = str(tmp_path / "results")
+    append_results(_results("2024-07-01", 24), root)
+    append_results(_results("2024-07-01", 24), root, overwrite_days=True)
+    assert len(read_results(root)) == 24
@@ -0,0 +1,76 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+xgb = pytest.importorskip("xgboost")
+
+import xgb_pipeline
+from xgb_pipeline import TARGET, load_feature_cache, predict_in_chunks, time_split, train_xgb
+
+
+def _write_dataset(path, n_rows=200):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "datetime": pd.date_range("2024-07-01", periods=n_rows, freq="5min").strftime("%d-%m-%Y %H:%M"),
+        "hour": rng.integers(0, 24, n_rows),
+        "temp": rng.random(n_rows),
+        TARGET: rng.random(n_rows),
+    })
+    df.to_csv(path, index=False)
+
+
+def test_time_split_boundaries():
+    # matches train_test_split(test_size=0.1): the test block is ceil(10%) of rows
+    assert time_split(100, 0.1, 0.1) == (81, 90)
+    assert time_split(101, 0.1, 0.1) == (81, 90)
+    assert time_split(100, 0.1, 0.0) == (90, 90)
+
+
+def test_feature_cache_hit_skips_csv(tmp_path, monkeypatch):
+    data = tmp_path / "data.csv"
+    _write_dataset(data)
+    first = load_feature_cache(str(data), str(tmp_path / "cache"))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("CSV parsed on a cache hit")
+
+    monkeypatch.setattr(xgb_pipeline, "load_features", fail)
+    second = load_feature_cache(str(data), str(tmp_path / "cache"))
+    np.testing.assert_array_equal(first["X"], second["X"])
+    assert second["features"] == ["hour", "temp"]
+
+
+def test_feature_cache_rebuilt_in_place(tmp_path):
+    data = tmp_path / "data.csv"
+    cache_dir = tmp_path / "cache"
+    _write_dataset(data, n_rows=200)
+    assert len(load_feature_cache(str(data), str(cache_dir))["X"]) == 200
+
+    _write_dataset(data, n_rows=150)
+    st = os.stat(data)
+    os.utime(data, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert len(load_feature_cache(str(data), str(cache_dir))["X"]) == 150
+    # the refreshed dataset replaces the old cache instead of adding a directory
+    assert len(os.listdir(cache_dir)) == 1
+
+
+def test_predict_in_chunks_matches_predict(tmp_path):
+    data = tmp_path / "data.csv"
+    _write_dataset(data)
+    booster, test_df, features = train_xgb(
+        str(data), model_file=str(tmp_path / "model.json"), cache_dir=str(tmp_path / "cache"),
+        n_estimators=10, early_stopping_rounds=3, n_threads=1
+    )
+    assert len(test_df) == 20
+    expected = booster.predict(xgb.DMatrix(test_df[features], feature_names=features))
+
+    # chunk size 7 splits the 20 test rows across a chunk boundary
+    np.testing.assert_allclose(predict_in_chunks(booster, test_df, chunk_size=7), expected, rtol=1e-6)
+    # columns are matched by name, not position
+    reordered = test_df[features[::-1]]
+    np.testing.assert_allclose(predict_in_chunks(booster, reordered, chunk_size=7), expected, rtol=1e-6)
+    # iterables of chunks are streamed as-is
+    chunks = (test_df.iloc[i:i + 6] for i in range(0, len(test_df), 6))
+    np.testing.assert_allclose(predict_in_chunks(booster, chunks), expected, rtol=1e-6)
@@ -1,5 +1,18 @@
 import os
 import json
+import hashlib
+
+def file_fingerprint(path, block_size=1 << 20):
+    """
+    Returns a sha256 hex digest of a file's contents, read in blocks.
+    Used to key cached artifacts so they're only rebuilt when the data changes.
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
 
 def save_forecast_json(forecast_df, output_file="outputs/forecast.json", last_n=None):
     """
@@ -0,0 +1,224 @@
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+TARGET = "Power demand"
+DATETIME_FORMAT = "%d-%m-%Y %H:%M"
+CACHE_VERSION = 1
+
+
+def load_features(processed_file="data/preprocessed_dataset.csv"):
+    """
+    Loads the preprocessed dataset and splits it into features and target.
+
+    Returns:
+    - df: full DataFrame with parsed datetime
+    - features: list of feature column names (everything except datetime and target)
+    """
+    df = pd.read_csv(processed_file)
+    df["datetime"] = pd.to_datetime(df["datetime"], format=DATETIME_FORMAT)
+    features = [c for c in df.columns if c not in ["datetime", TARGET]]
+    # Single-precision floats are what XGBoost uses internally anyway
+    df[features] = df[features].astype(np.float32)
+    return df, features
+
+
+def time_split(n_rows, test_size=0.1, valid_size=0.1):
+    """
+    Returns (train_end, valid_end) row indices for a time-ordered split:
+    [0, train_end) train, [train_end, valid_end) validation, [valid_end, n_rows) test.
+    The validation block sits right before the test block and is used for early stopping.
+    """
+    valid_end = n_rows - int(np.ceil(n_rows * test_size))
+    train_end = valid_end - int(np.ceil(valid_end * valid_size))
+    return train_end, valid_end
+
+
+def _atomic_save(path, write):
+    """
+    Writes a file through a temp path and renames it into place, so a killed run
+    never leaves a partial file behind.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def load_feature_cache(processed_file="data/preprocessed_dataset.csv",
+                       cache_dir="saved_models/xgb_cache"):
+    """
+    Returns the dataset as float32 arrays, parsing the CSV only when it has changed.
+
+    There is one cache directory per source path. Its meta.json records the file's
+    size and modification time, so a hit never reads the CSV; when the file changes the
+    directory is rebuilt in place rather than left behind next to a new one. Arrays are
+    stored as .npy files and memory-mapped on load; meta.json is written last and marks
+    the cache as complete.
+
+    Returns a dict with:
+    - X: (n_rows, n_features) float32 array
+    - y: (n_rows,) float32 array
+    - datetime: (n_rows,) datetime64[ns] array
+    - features: list of feature column names
+    """
+    path = os.path.abspath(processed_file)
+    st = os.stat(path)
+    source = {"path": path, "size": st.st_size, "mtime_ns": st.st_mtime_ns,
+              "version": CACHE_VERSION}
+    key_dir = os.path.join(cache_dir, hashlib.sha256(path.encode()).hexdigest()[:16])
+    meta_path = os.path.join(key_dir, "meta.json")
+
+    meta = None
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get("source") != source:
+            # stale: invalidate before the arrays are overwritten
+            os.remove(meta_path)
+            meta = None
+
+    if meta is not None:
+        print(f"✅ Using cached features from {key_dir}")
+    else:
+        print("⏳ Building feature cache...")
+        df, features = load_features(processed_file)
+        os.makedirs(key_dir, exist_ok=True)
+        arrays = {
+            "X": np.ascontiguousarray(df[features].to_numpy(dtype=np.float32)),
+            "y": df[TARGET].to_numpy(dtype=np.float32),
+            "datetime": df["datetime"].to_numpy(dtype="datetime64[ns]"),
+        }
+        for name, arr in arrays.items():
+            _atomic_save(os.path.join(key_dir, f"{name}.npy"), lambda f, a=arr: np.save(f, a))
+        meta = {"source": source, "features": features, "n_rows": len(df)}
+        _atomic_save(meta_path, lambda f: f.write(json.dumps(meta, indent=2).encode()))
+        print(f"✅ Feature cache saved at {key_dir}")
+
+    cache = {name: np.load(os.path.join(key_dir, f"{name}.npy"), mmap_mode="r")
+             for name in ("X", "y", "datetime")}
+    cache["features"] = meta["features"]
+    return cache
+
+
+def train_xgb(processed_file="data/preprocessed_dataset.csv",
+              model_file="saved_models/xgb_model.json",
+              cache_dir="saved_models/xgb_cache",
+              n_estimators=200, learning_rate=0.1, max_depth=6, max_bin=256,
+              early_stopping_rounds=20, n_threads=None,
+              test_size=0.1, valid_size=0.1, refit=True):
+    """
+    Trains the demand XGBoost model with histogram tree building on quantized
+    (QuantileDMatrix) inputs built from the cached feature arrays.
+
+    Parameters:
+    - n_threads: number of CPU threads for quantization and training (None = all cores)
+    - early_stopping_rounds: stop when the validation RMSE hasn't improved for this many
+      rounds (None disables early stopping)
+    - refit: after picking the number of rounds on the validation block, retrain on
+      train+validation so the final model sees the same data as a plain train/test split
+
+    Returns:
+    - booster: trained xgboost.Booster
+    - test_df: DataFrame with datetime, feature and target columns for the test split
+    - features: list of feature column names
+    """
+    cache = load_feature_cache(processed_file, cache_dir)
+    X, y, features = cache["X"], cache["y"], cache["features"]
+    train_end, valid_end = time_split(len(X), test_size, valid_size)
+    nthread = n_threads if n_threads is not None else -1
+
+    params = {
+        "objective": "reg:squarederror",
+        "eval_metric": "rmse",
+        "tree_method": "hist",
+        "max_bin": max_bin,
+        "eta": learning_rate,
+        "max_depth": max_depth,
+        "nthread": nthread,
+    }
+
+    dtrain = xgb.QuantileDMatrix(X[:train_end], label=y[:train_end], feature_names=features,
+                                 max_bin=max_bin, nthread=nthread)
+    dvalid = xgb.QuantileDMatrix(X[train_end:valid_end], label=y[train_end:valid_end],
+                                 feature_names=features, ref=dtrain, nthread=nthread)
+
+    print("⏳ Training XGBoost model...")
+    booster = xgb.train(
+        params,
+        dtrain,
+        num_boost_round=n_estimators,
+        evals=[(dtrain, "train"), (dvalid, "valid")],
+        early_stopping_rounds=early_stopping_rounds,
+        verbose_eval=False,
+    )
+    n_rounds = booster.best_iteration + 1 if early_stopping_rounds is not None else n_estimators
+
+    if refit:
+        print(f"⏳ Refitting on train+validation for {n_rounds} rounds...")
+        dfull = xgb.QuantileDMatrix(X[:valid_end], label=y[:valid_end], feature_names=features,
+                                    max_bin=max_bin, nthread=nthread)
+        booster = xgb.train(params, dfull, num_boost_round=n_rounds)
+    print(f"✅ XGBoost training completed ({n_rounds} rounds).")
+
+    os.makedirs(os.path.dirname(model_file), exist_ok=True)
+    booster.save_model(model_file)
+    print(f"✅ XGBoost model saved at {model_file}")
+
+    test_df = pd.DataFrame(np.asarray(X[valid_end:]), columns=features)
+    test_df.insert(0, "datetime", np.asarray(cache["datetime"][valid_end:]))
+    test_df[TARGET] = np.asarray(y[valid_end:])
+
+    return booster, test_df, features
+
+
+def _iter_chunks(X, chunk_size):
+    if isinstance(X, pd.DataFrame):
+        for start in range(0, len(X), chunk_size):
+            yield X.iloc[start:start + chunk_size]
+    elif isinstance(X, np.ndarray):
+        for start in range(0, len(X), chunk_size):
+            yield X[start:start + chunk_size]
+    else:
+        yield from X
+
+
+def predict_in_chunks(booster, X, chunk_size=500_000):
+    """
+    Predicts in fixed-size row chunks to bound peak memory.
+
+    Parameters:
+    - booster: trained xgboost.Booster
+    - X: DataFrame, 2D numpy array, or an iterable of DataFrame chunks
+      (e.g. pd.read_csv(..., chunksize=...)) so the full input never sits in memory
+    - chunk_size: number of rows scored per call (ignored for iterables)
+
+    DataFrame chunks are matched to the model's features by column name, so extra
+    columns or a different column order are handled and missing ones raise KeyError.
+
+    Returns a float32 numpy array of predictions.
+    """
+    # Only use the trees up to the best early-stopping iteration, if any
+    try:
+        iteration_range = (0, booster.best_iteration + 1)
+    except AttributeError:
+        iteration_range = (0, 0)
+
+    preds = []
+    for chunk in _iter_chunks(X, chunk_size):
+        if isinstance(chunk, pd.DataFrame):
+            chunk = chunk[booster.feature_names].astype(np.float32)
+        preds.append(booster.inplace_predict(chunk, iteration_range=iteration_range))
+    if not preds:
+        return np.empty(0, dtype=np.float32)
+    return np.concatenate(preds).astype(np.float32, copy=False)
+
+
+# ----------------------------
+# If run as script
+# ----------------------------
+if __name__ == "__main__":
+    train_xgb(processed_file="data/preprocessed_dataset.csv")